@@ -3,8 +3,9 @@ from flask import Flask
 from flask_socketio import SocketIO
 import config  # Your config module
 from sockets import register_socket_events
-from routes import stream_bp, download_bp
+from routes import stream_bp, download_bp, files_bp, sync_bp
 from utils import get_local_ip
+from utils.offload_utils import set_sleep
 
 # Flask setup
 app = Flask(__name__)
@@ -16,12 +17,17 @@ app.config["MAX_CONTENT_LENGTH"] = config.MAX_CONTENT_LENGTH
 # Socket.IO setup
 socketio = SocketIO(app, cors_allowed_origins=config.CORS_ALLOWED_ORIGINS)
 
+# Wait on offloaded work cooperatively, so long hashes/scans don't freeze other clients
+set_sleep(socketio.sleep)
+
 # Register all socket events
 register_socket_events(socketio)
 
 # Register blueprints
 app.register_blueprint(stream_bp, url_prefix="/stream")
 app.register_blueprint(download_bp, url_prefix="/download")
+app.register_blueprint(files_bp, url_prefix="/files")
+app.register_blueprint(sync_bp, url_prefix="/sync")
 
 if __name__ == "__main__":
     print(f"Server running at http://{get_local_ip()}:{config.PORT}")
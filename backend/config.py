@@ -6,6 +6,9 @@ import os
 MEDIA_ROOT = os.environ.get("MEDIA_ROOT", os.path.expanduser("~"))
 # MEDIA_ROOT = "D:/"
 
+# Where BitFlow keeps its own persistent caches (line indexes, hash caches, ...)
+CACHE_DIR = os.environ.get("BITFLOW_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".bitflow", "cache"))
+
 # === SERVER SETTINGS ===
 HOST = "0.0.0.0"
 
@@ -21,3 +24,58 @@ DEBUG = os.environ.get("DEBUG", "true").lower() == "true"
 
 # Maximum file size for uploads (in bytes) — if needed later
 MAX_CONTENT_LENGTH = int(os.environ.get("MAX_CONTENT_LENGTH", 1024 * 1024 * 1024))  # 1 GB
+
+# Native threads for blocking work (hashing, deltas, scans) so it never stalls the eventlet hub
+OFFLOAD_WORKERS = int(os.environ.get("OFFLOAD_WORKERS", 8))
+
+# === STREAMING SETTINGS ===
+# Serve MP4/MOV files with 'moov' at the end as a virtual fast-start file ('moov' moved to the front)
+MP4_FASTSTART = os.environ.get("MP4_FASTSTART", "true").lower() == "true"
+
+# Number of parsed MP4 box layouts kept in memory (keyed by path, invalidated on mtime)
+MP4_LAYOUT_CACHE_SIZE = int(os.environ.get("MP4_LAYOUT_CACHE_SIZE", 128))
+
+# Memory budget for the rewritten 'moov' boxes held by cached MP4 layouts
+MP4_LAYOUT_CACHE_BYTES = int(os.environ.get("MP4_LAYOUT_CACHE_BYTES", 256 * 1024 * 1024))  # 256 MB
+
+# Largest 'moov' box that will be held in memory for remuxing (in bytes)
+MP4_MAX_MOOV_SIZE = int(os.environ.get("MP4_MAX_MOOV_SIZE", 64 * 1024 * 1024))  # 64 MB
+
+# Memory budget for caching small, frequently streamed files (thumbnails, album art); 0 disables it
+HOT_CACHE_BYTES = int(os.environ.get("HOT_CACHE_BYTES", 256 * 1024 * 1024))  # 256 MB
+
+# Only files up to this size are cached; larger files are always streamed from disk
+HOT_CACHE_MAX_FILE_SIZE = int(os.environ.get("HOT_CACHE_MAX_FILE_SIZE", 2 * 1024 * 1024))  # 2 MB
+
+# Lines between checkpoints in the sparse line index used by /stream/text
+TEXT_INDEX_INTERVAL = int(os.environ.get("TEXT_INDEX_INTERVAL", 1000))
+
+# Number of line indexes kept in memory (all of them are also persisted under CACHE_DIR)
+TEXT_INDEX_CACHE_SIZE = int(os.environ.get("TEXT_INDEX_CACHE_SIZE", 64))
+
+# Most lines returned by a single /stream/text request
+TEXT_MAX_LINES = int(os.environ.get("TEXT_MAX_LINES", 5000))
+
+# Seconds between checks for new lines in follow (tail -f) mode
+TEXT_FOLLOW_INTERVAL = float(os.environ.get("TEXT_FOLLOW_INTERVAL", 1.0))
+
+# === DOWNLOAD SETTINGS ===
+# Number of file checksums kept in memory for /download/checksum (keyed by path and algorithm, invalidated on mtime)
+CHECKSUM_CACHE_SIZE = int(os.environ.get("CHECKSUM_CACHE_SIZE", 256))
+
+# Seconds /download/checksum waits for a hash before answering 202 "hashing" (clients then poll)
+CHECKSUM_WAIT = float(os.environ.get("CHECKSUM_WAIT", 10))
+
+# === SYNC SETTINGS ===
+# Number of delta-sync block signature sets kept in memory (keyed by path and block size, invalidated on mtime)
+SYNC_SIGNATURE_CACHE_SIZE = int(os.environ.get("SYNC_SIGNATURE_CACHE_SIZE", 32))
+
+# === DUPLICATE FINDER SETTINGS ===
+# Files smaller than this are ignored by the duplicate finder (in bytes)
+DUPES_MIN_SIZE = int(os.environ.get("DUPES_MIN_SIZE", 1))
+
+# Threads hashing files in parallel during a duplicate scan
+DUPES_HASH_WORKERS = int(os.environ.get("DUPES_HASH_WORKERS", 4))
+
+# Most duplicate groups returned per page
+DUPES_MAX_PAGE_SIZE = int(os.environ.get("DUPES_MAX_PAGE_SIZE", 500))
@@ -1,5 +1,7 @@
 # backend/routes/__init__.py
 from .stream import stream_bp
 from .download import download_bp
+from .files import files_bp
+from .sync import sync_bp
 
-__all__ = ["stream_bp", "download_bp"]
+__all__ = ["stream_bp", "download_bp", "files_bp", "sync_bp"]
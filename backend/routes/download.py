@@ -1,7 +1,8 @@
 # backend/routes/download.py
 from flask import Blueprint, request
+import config
 from utils import logical_to_real_path
-from utils.download_utils import download_file_response
+from utils.download_utils import download_file_response, checksum_status, make_etag
 
 download_bp = Blueprint("download", __name__, url_prefix="/download")
 
@@ -31,3 +32,48 @@ def download_file():
         return download_file_response(real_path)
     except Exception as e:
         return {"status": "error", "message": f"Failed to download file: {e}"}, 500
+
+@download_bp.route("/checksum", methods=["GET"])
+def download_checksum():
+    """
+    Return a checksum of a file under MEDIA_ROOT, so clients can verify downloads.
+    Large files are hashed in the background: if the digest isn't ready within
+    CHECKSUM_WAIT seconds the response is 202 with status "hashing" and progress,
+    and the client polls the same URL until it gets the checksum.
+    Query parameters:
+        - path: logical path under MEDIA_ROOT (required)
+        - algorithm: md5, sha1, sha256 or blake2b (default: sha256)
+    """
+    logical_path = request.args.get("path")
+    algorithm = request.args.get("algorithm", "sha256").lower()
+    if not logical_path:
+        return {"status": "error", "message": "Missing 'path' query parameter"}, 400
+
+    try:
+        real_path = logical_to_real_path(logical_path)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+
+    if not real_path.exists():
+        return {"status": "error", "message": "File does not exist"}, 404
+    if not real_path.is_file():
+        return {"status": "error", "message": "Path is not a file"}, 400
+
+    try:
+        stat = real_path.stat()
+        result = checksum_status(real_path, algorithm, wait=config.CHECKSUM_WAIT)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to compute checksum: {e}"}, 500
+
+    if result["checksum"] is None:
+        return {"status": "hashing", "data": {"path": logical_path, "algorithm": algorithm, **result}}, 202
+    return {
+        "status": "success",
+        "path": logical_path,
+        "algorithm": algorithm,
+        "checksum": result["checksum"],
+        "size": stat.st_size,
+        "etag": make_etag(stat),
+    }
@@ -0,0 +1,48 @@
+# backend/routes/files.py
+from flask import Blueprint, request
+from utils import list_directory_sync
+from utils.dupe_utils import get_duplicates_page
+
+files_bp = Blueprint("files", __name__, url_prefix="/files")
+
+
+@files_bp.route("/list", methods=["GET"])
+def list_files():
+    """
+    List a directory (or describe a single file) under MEDIA_ROOT.
+    Same payload as the 'list_dir' socket event, for plain HTTP clients.
+    Query parameters:
+        - path: logical path under MEDIA_ROOT (default: "/")
+    """
+    logical_path = request.args.get("path", "/")
+
+    try:
+        result = list_directory_sync(logical_path)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+    except FileNotFoundError as e:
+        return {"status": "error", "message": str(e)}, 404
+    except PermissionError as e:
+        return {"status": "error", "message": str(e)}, 403
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to list directory: {e}"}, 500
+
+    return {"status": "success", "data": result}
+
+
+@files_bp.route("/duplicates", methods=["GET"])
+def list_duplicates():
+    """
+    Return one page of duplicate-file groups from the last duplicate scan,
+    largest reclaimable space first. Scans are started with the 'find_duplicates' socket event.
+    Query parameters:
+        - page: 0-based page number (default: 0)
+        - page_size: groups per page (default: 50)
+    """
+    page = request.args.get("page", 0, type=int)
+    page_size = request.args.get("page_size", 50, type=int)
+
+    result = get_duplicates_page(page, page_size)
+    if result is None:
+        return {"status": "error", "message": "No duplicate scan results yet"}, 404
+    return {"status": "success", "data": result}
@@ -1,7 +1,10 @@
 # backend/routes/stream.py
 from flask import Blueprint, request, abort
 from pathlib import Path
-from utils import logical_to_real_path, is_playable, is_image, stream_file_response
+import config
+from utils import logical_to_real_path, is_playable, is_image, is_text, stream_file_response, hot_cache
+from utils.offload_utils import run_blocking
+from utils.text_utils import read_lines, tail_lines
 
 stream_bp = Blueprint("stream", __name__, url_prefix="/stream")
 
@@ -36,3 +39,61 @@ def stream_file():
         return stream_file_response(real_path)
     except Exception as e:
         return {"status": "error", "message": f"Failed to stream file: {e}"}, 500
+
+
+@stream_bp.route("/text", methods=["GET"])
+def stream_text():
+    """
+    Return a window of lines from a text file, reading only the bytes needed.
+    A sparse line index is built in the background (and persisted) on first use.
+    Query parameters:
+        - path: logical path under MEDIA_ROOT (required)
+        - start: 0-based first line (default: 0)
+        - count: number of lines (default: 100, capped at TEXT_MAX_LINES)
+        - tail: return the last N lines instead of start/count
+    Returns 202 with status "indexing" (and progress) while a far-off `start` is still being indexed.
+    For live updates use the 'tail_text' socket event.
+    """
+    logical_path = request.args.get("path")
+    if not logical_path:
+        return {"status": "error", "message": "Missing 'path' query parameter"}, 400
+
+    try:
+        real_path = logical_to_real_path(logical_path)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+
+    if not real_path.exists():
+        return {"status": "error", "message": "File does not exist"}, 404
+    if not real_path.is_file():
+        return {"status": "error", "message": "Path is not a file"}, 400
+    if not is_text(real_path):
+        return {"status": "error", "message": "Unsupported media type"}, 415
+
+    start = request.args.get("start", 0, type=int)
+    count = request.args.get("count", 100, type=int)
+    tail = request.args.get("tail", None, type=int)
+    if start < 0 or count < 0 or (tail is not None and tail < 0):
+        return {"status": "error", "message": "'start', 'count' and 'tail' must not be negative"}, 400
+
+    try:
+        if tail is not None:
+            result = run_blocking(tail_lines, real_path, min(tail, config.TEXT_MAX_LINES))
+        else:
+            result = run_blocking(read_lines, real_path, start, min(count, config.TEXT_MAX_LINES))
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to read file: {e}"}, 500
+
+    if result.get("indexing"):
+        # Requested line isn't indexed yet: report progress, the client retries later
+        return {"status": "indexing", "data": {"path": logical_path, **result}}, 202
+    return {"status": "success", "data": {"path": logical_path, **result}}
+
+
+@stream_bp.route("/cache", methods=["GET"])
+def stream_cache_stats():
+    """
+    Report hot-file cache instrumentation: entries, resident size,
+    hits/misses/bypasses, evictions and hit ratio.
+    """
+    return {"status": "success", "data": hot_cache.stats()}
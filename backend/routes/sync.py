@@ -0,0 +1,104 @@
+# backend/routes/sync.py
+from flask import Blueprint, Response, request
+from utils import logical_to_real_path
+from utils.download_utils import make_etag
+from utils.offload_utils import iter_blocking, run_blocking
+from utils.sync_utils import get_signatures, generate_delta, validate_block_size
+
+sync_bp = Blueprint("sync", __name__, url_prefix="/sync")
+
+
+def _resolve_file(logical_path):
+    """Resolve a logical path to an existing file, or return an error response tuple."""
+    if not logical_path:
+        return None, ({"status": "error", "message": "Missing 'path' query parameter"}, 400)
+    try:
+        real_path = logical_to_real_path(logical_path)
+    except ValueError as e:
+        return None, ({"status": "error", "message": str(e)}, 400)
+    if not real_path.exists():
+        return None, ({"status": "error", "message": "File does not exist"}, 404)
+    if not real_path.is_file():
+        return None, ({"status": "error", "message": "Path is not a file"}, 400)
+    return real_path, None
+
+
+@sync_bp.route("/signature", methods=["GET"])
+def sync_signature():
+    """
+    Return the rolling-checksum block signatures of a file (cached by mtime).
+    Clients use these to work out locally which blocks they already have.
+    Query parameters:
+        - path: logical path under MEDIA_ROOT (required)
+        - block_size: block size in bytes (default: chosen from the file size)
+    """
+    real_path, error = _resolve_file(request.args.get("path"))
+    if error:
+        return error
+
+    block_size = request.args.get("block_size")
+    if block_size is not None:
+        try:
+            block_size = int(block_size)
+        except ValueError:
+            return {"status": "error", "message": "Invalid 'block_size': must be an integer"}, 400
+
+    try:
+        stat = real_path.stat()
+        signature = run_blocking(get_signatures, real_path, block_size)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to compute signatures: {e}"}, 500
+
+    return {
+        "status": "success",
+        "path": request.args.get("path"),
+        "etag": make_etag(stat),
+        **signature,
+    }
+
+
+@sync_bp.route("/delta", methods=["POST"])
+def sync_delta():
+    """
+    Stream a binary delta that turns the client's copy into the server's file.
+    Query parameters:
+        - path: logical path under MEDIA_ROOT (required)
+    JSON body:
+        - block_size: block size the client used
+        - blocks: [[weak, strong], ...] signatures of the client's copy
+    See utils/sync_utils.py for the delta format.
+    """
+    real_path, error = _resolve_file(request.args.get("path"))
+    if error:
+        return error
+
+    body = request.get_json(silent=True)
+    if body is None:
+        body = {}
+    if not isinstance(body, dict):
+        return {"status": "error", "message": "Request body must be a JSON object"}, 400
+    blocks = body.get("blocks")
+    try:
+        block_size = validate_block_size(int(body.get("block_size", 0)))
+    except (TypeError, ValueError) as e:
+        return {"status": "error", "message": f"Invalid 'block_size': {e}"}, 400
+    if not isinstance(blocks, list):
+        return {"status": "error", "message": "Missing 'blocks' in request body"}, 400
+
+    try:
+        stat = real_path.stat()
+        delta = generate_delta(real_path, blocks, block_size)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to compute delta: {e}"}, 500
+
+    # The rolling checksum is pure Python: run it on a native thread, not the event loop
+    resp = Response(iter_blocking(delta), mimetype="application/octet-stream")
+    resp.headers.update({
+        "ETag": make_etag(stat),
+        "X-BitFlow-Size": str(stat.st_size),
+    })
+    return resp
@@ -1,5 +1,7 @@
 # backend/sockets/__init__.py
 from .file_events import register_file_events
+from .text_events import register_text_events
+from .dupe_events import register_dupe_events
 
 def register_socket_events(socketio):
     """
@@ -7,5 +9,7 @@ def register_socket_events(socketio):
     This ensures the server knows how to handle real-time events.
     """
     register_file_events(socketio)
+    register_text_events(socketio)
+    register_dupe_events(socketio)
 
 __all__ = ["register_socket_events"]
@@ -0,0 +1,89 @@
+# backend/sockets/dupe_events.py
+import queue
+from flask import request
+from utils.dupe_utils import find_duplicates, get_duplicates_page
+from utils.offload_utils import run_blocking
+
+LOGICAL_ROOT = "/"
+
+def register_dupe_events(socketio):
+    @socketio.on("find_duplicates")
+    def handle_find_duplicates(data):
+        data = data or {}
+        logical_path = data.get("path", LOGICAL_ROOT)
+        sid = request.sid
+        try:
+            page_size = int(data.get("page_size", 50))
+        except (TypeError, ValueError) as e:
+            socketio.emit("find_duplicates_result", {"status": "error", "code": 400, "message": str(e)}, to=sid)
+            return
+
+        # Immediately notify client we're scanning
+        socketio.emit("find_duplicates_status", {"status": "loading", "path": logical_path}, to=sid)
+
+        def background_task():
+            events = queue.SimpleQueue()
+
+            def drain():
+                while True:
+                    try:
+                        evt = events.get_nowait()
+                    except queue.Empty:
+                        return
+                    emit_progress(evt, sid)
+
+            try:
+                # Walk and hash on a native thread; its progress is queued and emitted from here
+                summary = run_blocking(find_duplicates, logical_path, progress_cb=events.put, poll=drain)
+                socketio.emit("find_duplicates_result", {
+                    "status": "success",
+                    "data": {**summary, "first_page": get_duplicates_page(0, page_size)}
+                }, to=sid)
+
+            except Exception as e:
+                msg = str(e)
+                code = 500
+                if "already running" in msg:
+                    code = 409
+                elif "not exist" in msg.lower():
+                    code = 404
+                elif "not a directory" in msg.lower():
+                    code = 400
+                elif "permission denied" in msg.lower():
+                    code = 403
+                elif "outside MEDIA_ROOT" in msg:
+                    code = 400
+
+                socketio.emit("find_duplicates_result", {"status": "error", "code": code, "message": msg}, to=sid)
+
+        def emit_progress(evt, sid):
+            if evt.get("event") == "progress":
+                socketio.emit("find_duplicates_status", {
+                    "status": "progress",
+                    "path": evt.get("path"),
+                    "stage": evt.get("stage"),
+                    "done": evt.get("done"),
+                    "total": evt.get("total"),
+                    "percent": evt.get("percent"),
+                    "scanned": evt.get("scanned"),
+                    "bytes_read": evt.get("bytes_read")
+                }, to=sid)
+            elif evt.get("event") == "done":
+                socketio.emit("find_duplicates_status", {"status": "done", "path": evt.get("path")}, to=sid)
+
+        # Start background task
+        socketio.start_background_task(background_task)
+
+    @socketio.on("duplicates_page")
+    def handle_duplicates_page(data):
+        data = data or {}
+        try:
+            page = get_duplicates_page(int(data.get("page", 0)), int(data.get("page_size", 50)))
+        except (TypeError, ValueError) as e:
+            socketio.emit("duplicates_page_result", {"status": "error", "code": 400, "message": str(e)}, to=request.sid)
+            return
+        if page is None:
+            socketio.emit("duplicates_page_result", {"status": "error", "code": 404,
+                                                     "message": "No duplicate scan results yet"}, to=request.sid)
+            return
+        socketio.emit("duplicates_page_result", {"status": "success", "data": page}, to=request.sid)
@@ -0,0 +1,98 @@
+# backend/sockets/text_events.py
+import threading
+from flask import request
+import config
+from utils import logical_to_real_path, is_text
+from utils.offload_utils import run_blocking
+from utils.text_utils import tail_lines, read_appended
+
+_followers = {}  # sid -> threading.Event, set to stop that client's follow task
+_followers_lock = threading.Lock()
+
+
+def _stop_follower(sid):
+    with _followers_lock:
+        stop = _followers.pop(sid, None)
+    if stop:
+        stop.set()
+    return stop is not None
+
+
+def register_text_events(socketio):
+    @socketio.on("tail_text")
+    def handle_tail_text(data):
+        """
+        Send the last N lines of a text file, then keep sending appended lines
+        (like `tail -f`) until 'tail_stop' or disconnect.
+        Payload: {"path": logical path, "lines": N (default 100)}
+        A trailing line without a newline yet is held back until it is complete.
+        """
+        data = data or {}
+        logical_path = data.get("path")
+        sid = request.sid
+
+        try:
+            if not logical_path:
+                raise ValueError("Missing 'path'")
+            count = min(max(int(data.get("lines", 100)), 0), config.TEXT_MAX_LINES)
+            real_path = logical_to_real_path(logical_path)
+        except (TypeError, ValueError) as e:
+            socketio.emit("tail_text_result", {"status": "error", "code": 400, "message": str(e)}, to=sid)
+            return
+
+        if not real_path.is_file():
+            socketio.emit("tail_text_result", {"status": "error", "code": 404,
+                                               "message": "File does not exist"}, to=sid)
+            return
+        if not is_text(real_path):
+            socketio.emit("tail_text_result", {"status": "error", "code": 415,
+                                               "message": "Unsupported media type"}, to=sid)
+            return
+
+        # One follow task per client: a new 'tail_text' replaces the previous one
+        _stop_follower(sid)
+        stop = threading.Event()
+        with _followers_lock:
+            _followers[sid] = stop
+
+        def background_task():
+            try:
+                result = run_blocking(tail_lines, real_path, count, partial=False)
+                socketio.emit("tail_text_result", {"status": "success",
+                                                   "data": {"path": logical_path, **result}}, to=sid)
+                offset = result["offset"]
+
+                while not stop.is_set():
+                    socketio.sleep(config.TEXT_FOLLOW_INTERVAL)
+                    if stop.is_set():
+                        break
+                    lines, offset_new = read_appended(real_path, offset)
+                    if lines is None:
+                        # Truncated or rotated in place: follow from the start again
+                        socketio.emit("tail_text_status", {"status": "truncated", "path": logical_path}, to=sid)
+                    elif lines:
+                        socketio.emit("tail_text_lines", {"path": logical_path, "lines": lines,
+                                                          "offset": offset_new}, to=sid)
+                    offset = offset_new
+
+            except FileNotFoundError:
+                socketio.emit("tail_text_status", {"status": "error", "code": 404, "path": logical_path,
+                                                   "message": "File does not exist"}, to=sid)
+            except Exception as e:
+                socketio.emit("tail_text_status", {"status": "error", "code": 500, "path": logical_path,
+                                                   "message": str(e)}, to=sid)
+            finally:
+                with _followers_lock:
+                    if _followers.get(sid) is stop:
+                        del _followers[sid]
+
+        socketio.start_background_task(background_task)
+
+    @socketio.on("tail_stop")
+    def handle_tail_stop(data=None):
+        if _stop_follower(request.sid):
+            socketio.emit("tail_text_status", {"status": "stopped"}, to=request.sid)
+
+    @socketio.on("disconnect")
+    def handle_disconnect(*args):
+        _stop_follower(request.sid)
@@ -9,6 +9,7 @@ from .stream_utils import (
     get_mime_type,
     is_playable,
     is_image,
+    is_text,
     file_stream_generator,
     stream_file_response
 )
@@ -16,6 +17,8 @@ from .download_utils import (
     file_stream_generator as download_file_stream_generator,
     download_file_response
 )
+from .mp4_utils import is_mp4, get_faststart_layout
+from .hot_cache import hot_cache
 from .ip_utils import get_local_ip
 
 __all__ = [
@@ -27,9 +30,13 @@ __all__ = [
     "get_mime_type",
     "is_playable",
     "is_image",
+    "is_text",
     "file_stream_generator",
     "stream_file_response",
     "download_file_stream_generator",
     "download_file_response",
+    "is_mp4",
+    "get_faststart_layout",
+    "hot_cache",
     "get_local_ip",
 ]
@@ -1,9 +1,20 @@
 # backend/utils/download_utils.py
+from collections import OrderedDict
 from pathlib import Path
+from email.utils import formatdate
 from flask import Response, request, abort
+import hashlib
 import mimetypes
+import threading
+import config
+from .offload_utils import executor, wait_done
 
 CHUNK_SIZE = 10 * 1024 * 1024  # 10 MB
+CHECKSUM_ALGORITHMS = {"md5", "sha1", "sha256", "blake2b"}
+
+_checksum_cache = OrderedDict()  # (real path, algorithm) -> (mtime_ns, size, hexdigest)
+_checksum_jobs = {}  # (real path, algorithm) -> running background hash (see checksum_status)
+_checksum_lock = threading.Lock()
 
 def get_mime_type(path: Path) -> str:
     mime_type, _ = mimetypes.guess_type(str(path))
@@ -30,15 +41,100 @@ def parse_range_header(range_header: str, file_size: int):
     except Exception:
         return None, None
 
+def make_etag(stat) -> str:
+    """Build a strong validator from a file's mtime and size."""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+def file_checksum(file_path: Path, algorithm: str = "sha256", progress_cb=None) -> str:
+    """
+    Return the hex digest of a file, cached per (path, algorithm).
+    The cached value is reused until the file's mtime or size changes.
+    `progress_cb(nbytes)`, if given, is called after every chunk hashed.
+    """
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise ValueError(f"Unsupported checksum algorithm '{algorithm}'")
+
+    stat = file_path.stat()
+    key = (str(file_path), algorithm)
+    with _checksum_lock:
+        cached = _checksum_cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _checksum_cache.move_to_end(key)
+            return cached[2]
+
+    hasher = hashlib.new(algorithm)
+    with open(file_path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            hasher.update(chunk)
+            if progress_cb:
+                progress_cb(len(chunk))
+    digest = hasher.hexdigest()
+
+    with _checksum_lock:
+        _checksum_cache[key] = (stat.st_mtime_ns, stat.st_size, digest)
+        _checksum_cache.move_to_end(key)
+        while len(_checksum_cache) > config.CHECKSUM_CACHE_SIZE:
+            _checksum_cache.popitem(last=False)
+    return digest
+
+def checksum_status(file_path: Path, algorithm: str = "sha256", wait: float = 0.0) -> dict:
+    """
+    Like file_checksum, but large files are hashed in the background. Starts hashing
+    (once per file), waits up to `wait` seconds for it and returns either
+    {"checksum": hexdigest} or {"checksum": None, "hashed", "size", "percent"}.
+    Errors from the background hash are raised by the call that collects it.
+    """
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise ValueError(f"Unsupported checksum algorithm '{algorithm}'")
+
+    stat = file_path.stat()
+    key = (str(file_path), algorithm)
+    with _checksum_lock:
+        cached = _checksum_cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _checksum_cache.move_to_end(key)
+            _checksum_jobs.pop(key, None)
+            return {"checksum": cached[2]}
+        job = _checksum_jobs.get(key)
+        if job is None or job["version"] != (stat.st_mtime_ns, stat.st_size):
+            job = {"version": (stat.st_mtime_ns, stat.st_size), "hashed": 0}
+
+            def progress(nbytes, job=job):
+                job["hashed"] += nbytes
+
+            job["future"] = executor.submit(file_checksum, file_path, algorithm, progress)
+            _checksum_jobs[key] = job
+
+    if wait_done(job["future"], wait):
+        with _checksum_lock:
+            if _checksum_jobs.get(key) is job:
+                del _checksum_jobs[key]
+        return {"checksum": job["future"].result()}
+    return {
+        "checksum": None,
+        "hashed": job["hashed"],
+        "size": stat.st_size,
+        "percent": job["hashed"] / stat.st_size * 100.0 if stat.st_size else None,
+    }
+
 def download_file_response(file_path: Path):
     """
     Return a Flask Response for downloading a file.
-    Supports HTTP Range headers for partial downloads.
+    Supports HTTP Range headers for partial downloads, and If-Range so that
+    resumed downloads restart from scratch if the file changed in between.
     """
     mime_type = get_mime_type(file_path)
-    file_size = file_path.stat().st_size
+    stat = file_path.stat()
+    file_size = stat.st_size
+    etag = make_etag(stat)
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    validators = {"ETag": etag, "Last-Modified": last_modified, "Accept-Ranges": "bytes"}
 
     range_header = request.headers.get("Range", None)
+    if_range = request.headers.get("If-Range", None)
+    if range_header and if_range and if_range not in (etag, last_modified):
+        range_header = None  # Validator mismatch: send the whole (new) file
+
     if range_header:
         start, end = parse_range_header(range_header, file_size)
         if start is None or end is None:
@@ -60,9 +156,9 @@ def download_file_response(file_path: Path):
         resp = Response(partial_stream(), status=206, mimetype=mime_type)
         resp.headers.update({
             "Content-Range": f"bytes {start}-{end}/{file_size}",
-            "Accept-Ranges": "bytes",
             "Content-Length": str(length),
-            "Content-Disposition": f'attachment; filename="{file_path.name}"'
+            "Content-Disposition": f'attachment; filename="{file_path.name}"',
+            **validators
         })
         return resp
 
@@ -70,6 +166,7 @@ def download_file_response(file_path: Path):
     resp = Response(file_stream_generator(file_path), mimetype=mime_type)
     resp.headers.update({
         "Content-Length": str(file_size),
-        "Content-Disposition": f'attachment; filename="{file_path.name}"'
+        "Content-Disposition": f'attachment; filename="{file_path.name}"',
+        **validators
     })
     return resp
@@ -0,0 +1,252 @@
+# backend/utils/dupe_utils.py
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import config
+from .file_utils import logical_to_real_path, _normalize_logical
+
+# ---------------------------
+# Config
+# ---------------------------
+EDGE_BLOCK_SIZE = 64 * 1024  # Bytes hashed from each end of a file in the partial stage
+READ_SIZE = 1024 * 1024  # Bytes read at a time when hashing whole files
+PROGRESS_INTERVAL = 0.5  # Seconds between progress events
+
+_scan_lock = threading.Lock()
+_results_lock = threading.Lock()
+_results = None  # Last scan result, loaded lazily from disk
+
+# ---------------------------
+# Cache files
+# ---------------------------
+
+def _cache_path(name: str) -> Path:
+    return Path(config.CACHE_DIR) / "dupes" / name
+
+def _load_json(path: Path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def _save_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+# ---------------------------
+# Scan stages
+# ---------------------------
+
+def _walk(root: str, progress):
+    """Single scandir walk: yield (path, size, mtime_ns, (dev, inode)) for regular, non-hidden files."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            progress()
+                            yield entry.path, stat.st_size, stat.st_mtime_ns, (stat.st_dev, stat.st_ino)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+def _edge_hash(path: str, size: int) -> str:
+    """Hash the first and last EDGE_BLOCK_SIZE bytes (the whole file if it is small)."""
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        hasher.update(f.read(EDGE_BLOCK_SIZE))
+        if size > EDGE_BLOCK_SIZE:
+            f.seek(max(EDGE_BLOCK_SIZE, size - EDGE_BLOCK_SIZE))
+            hasher.update(f.read(EDGE_BLOCK_SIZE))
+    return hasher.hexdigest()
+
+def _full_hash(path: str) -> str:
+    hasher = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _edge_bytes(size: int) -> int:
+    return min(size, 2 * EDGE_BLOCK_SIZE)
+
+def _group_by(items: list, key) -> list:
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return [group for group in groups.values() if len(group) > 1]
+
+def _to_logical(real_path: str, media_root: str) -> str:
+    return "/" + os.path.relpath(real_path, media_root).replace(os.sep, "/")
+
+def find_duplicates(logical_path: str = "/", progress_cb=None) -> dict:
+    """
+    Find duplicate files under a logical path in three stages:
+      1. bucket files by size from a single scandir walk,
+      2. hash the first and last blocks of same-size files,
+      3. fully hash only the files whose size and edge hash still collide.
+    Hashes are cached on disk by (path, size, mtime), so rescans only hash new or changed files.
+    Hard links to the same inode are counted once. Returns the stored result summary.
+    """
+    if not _scan_lock.acquire(blocking=False):
+        raise RuntimeError("A duplicate scan is already running")
+    try:
+        return _find_duplicates(_normalize_logical(logical_path), progress_cb)
+    finally:
+        _scan_lock.release()
+
+def _find_duplicates(logical_path: str, progress_cb) -> dict:
+    started = time.monotonic()
+    real_root = logical_to_real_path(logical_path)
+    if not real_root.exists():
+        raise FileNotFoundError(f"Path '{logical_path}' does not exist")
+    if not real_root.is_dir():
+        raise NotADirectoryError(f"Path '{logical_path}' is not a directory")
+    media_root = str(Path(config.MEDIA_ROOT).resolve())
+
+    cache_file = _cache_path("hashes.json")
+    old_cache = _load_json(cache_file, {})
+    cache = {}  # path -> [size, mtime_ns, edge hash | None, full hash | None]
+    counters = {"scanned": 0, "bytes_read": 0}
+    last_emit = [0.0]
+
+    def emit(stage, done=None, total=None, force=False):
+        now = time.monotonic()
+        if progress_cb and (force or now - last_emit[0] >= PROGRESS_INTERVAL):
+            last_emit[0] = now
+            percent = (done / total * 100.0) if (total and done is not None) else None
+            progress_cb({"event": "progress", "path": logical_path, "stage": stage, "done": done,
+                         "total": total, "percent": percent, "scanned": counters["scanned"],
+                         "bytes_read": counters["bytes_read"]})
+
+    def on_file():
+        counters["scanned"] += 1
+        emit("walk", counters["scanned"])
+
+    # Stage 1: size buckets, one entry per inode
+    files = []
+    seen_inodes = set()
+    for path, size, mtime_ns, inode in _walk(str(real_root), on_file):
+        if size < config.DUPES_MIN_SIZE or inode in seen_inodes:
+            continue
+        seen_inodes.add(inode)
+        cached = old_cache.get(path)
+        if cached and cached[0] == size and cached[1] == mtime_ns:
+            cache[path] = cached
+        else:
+            cache[path] = [size, mtime_ns, None, None]
+        files.append(path)
+    emit("walk", counters["scanned"], counters["scanned"], force=True)
+    candidates = [path for group in _group_by(files, lambda p: cache[p][0]) for path in group]
+
+    def run_stage(stage, paths, slot, hash_fn, cost):
+        todo = [path for path in paths if cache[path][slot] is None]
+        done = len(paths) - len(todo)
+        emit(stage, done, len(paths), force=True)
+        with ThreadPoolExecutor(max_workers=config.DUPES_HASH_WORKERS) as pool:
+            futures = {path: pool.submit(hash_fn, path) for path in todo}
+            for path, future in futures.items():
+                try:
+                    cache[path][slot] = future.result()
+                    counters["bytes_read"] += cost(path)
+                except OSError:
+                    cache[path][slot] = None
+                done += 1
+                emit(stage, done, len(paths))
+        emit(stage, done, len(paths), force=True)
+        return [path for path in paths if cache[path][slot] is not None]
+
+    # Stage 2: first + last block
+    candidates = run_stage("partial", candidates, 2,
+                           lambda p: _edge_hash(p, cache[p][0]), lambda p: _edge_bytes(cache[p][0]))
+    groups = _group_by(candidates, lambda p: (cache[p][0], cache[p][2]))
+
+    # Stage 3: full hash, unless the edge hash already covered the whole file
+    needs_full = [path for group in groups for path in group if cache[path][0] > 2 * EDGE_BLOCK_SIZE]
+    hashed = set(run_stage("full", needs_full, 3, _full_hash, lambda p: cache[p][0]))
+    final = []
+    for group in groups:
+        if cache[group[0]][0] > 2 * EDGE_BLOCK_SIZE:
+            final.extend(_group_by([p for p in group if p in hashed], lambda p: cache[p][3]))
+        else:
+            final.append(group)
+
+    # Persist only entries that carry a hash, keeping those from earlier scans of other directories
+    root_prefix = str(real_root).rstrip(os.sep) + os.sep
+    merged = {path: entry for path, entry in old_cache.items() if not path.startswith(root_prefix)}
+    merged.update(cache)
+    _save_json(cache_file, {path: entry for path, entry in merged.items() if entry[2] or entry[3]})
+
+    result_groups = []
+    for group in final:
+        size = cache[group[0]][0]
+        result_groups.append({
+            "size": size,
+            "count": len(group),
+            "reclaimable": size * (len(group) - 1),
+            "files": sorted(_to_logical(path, media_root) for path in group),
+        })
+    result_groups.sort(key=lambda g: (-g["reclaimable"], g["files"][0]))
+
+    result = {
+        "path": logical_path,
+        "scanned_at": time.time(),
+        "duration": time.monotonic() - started,
+        "files_scanned": counters["scanned"],
+        "bytes_read": counters["bytes_read"],
+        "groups": result_groups,
+        "total_groups": len(result_groups),
+        "total_reclaimable": sum(g["reclaimable"] for g in result_groups),
+    }
+    global _results
+    with _results_lock:
+        _results = result
+        _save_json(_cache_path("results.json"), result)
+
+    if progress_cb:
+        progress_cb({"event": "done", "path": logical_path})
+    return summarize(result)
+
+# ---------------------------
+# Results
+# ---------------------------
+
+def summarize(result: dict) -> dict:
+    return {key: value for key, value in result.items() if key != "groups"}
+
+def get_duplicates_page(page: int = 0, page_size: int = 50) -> dict | None:
+    """Return one page of duplicate groups from the last scan (largest reclaimable first), or None."""
+    global _results
+    with _results_lock:
+        if _results is None:
+            _results = _load_json(_cache_path("results.json"), None)
+        result = _results
+    if result is None:
+        return None
+
+    page = max(page, 0)
+    page_size = max(1, min(page_size, config.DUPES_MAX_PAGE_SIZE))
+    start = page * page_size
+    return {
+        **summarize(result),
+        "page": page,
+        "page_size": page_size,
+        "pages": -(-result["total_groups"] // page_size),
+        "groups": result["groups"][start:start + page_size],
+    }
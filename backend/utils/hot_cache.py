@@ -0,0 +1,101 @@
+# backend/utils/hot_cache.py
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import config
+
+
+class HotFileCache:
+    """
+    Byte-budgeted LRU cache of whole small files, for thumbnails, album art and
+    other files that are requested over and over again.
+    Entries are keyed by (device, inode, size, mtime), so edits and renames are
+    picked up without any invalidation. Files above `max_file_size` bypass the
+    cache entirely, so a single large video can never flush it.
+    """
+
+    def __init__(self, max_bytes: int, max_file_size: int):
+        self.max_bytes = max_bytes
+        self.max_file_size = min(max_file_size, max_bytes)
+        self._entries = OrderedDict()  # key -> bytes
+        self._by_inode = {}  # (device, inode) -> current key
+        self._resident = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(stat: os.stat_result) -> tuple:
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def cacheable(self, stat: os.stat_result) -> bool:
+        return self.max_bytes > 0 and stat.st_size <= self.max_file_size
+
+    def get(self, path: Path, stat: os.stat_result) -> bytes | None:
+        """
+        Return the file's content as a single buffer, reading and caching it on a miss.
+        Returns None (and counts a bypass) for files that are too large to cache.
+        """
+        if not self.cacheable(stat):
+            with self._lock:
+                self.bypassed += 1
+            return None
+
+        key = self.make_key(stat)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        with open(path, "rb") as f:
+            data = f.read(stat.st_size + 1)
+        if len(data) != stat.st_size:
+            return data  # Changed while reading: serve it, but don't cache a torn read
+
+        with self._lock:
+            if key not in self._entries:
+                self._drop(self._by_inode.get(key[:2]))
+                self._entries[key] = data
+                self._by_inode[key[:2]] = key
+                self._resident += len(data)
+                while self._resident > self.max_bytes:
+                    self._drop(next(iter(self._entries)))
+                    self.evictions += 1
+        return data
+
+    def _drop(self, key):
+        data = self._entries.pop(key, None) if key else None
+        if data is not None:
+            self._resident -= len(data)
+            if self._by_inode.get(key[:2]) == key:
+                del self._by_inode[key[:2]]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_inode.clear()
+            self._resident = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "resident_bytes": self._resident,
+                "max_bytes": self.max_bytes,
+                "max_file_size": self.max_file_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else None,
+            }
+
+
+hot_cache = HotFileCache(config.HOT_CACHE_BYTES, config.HOT_CACHE_MAX_FILE_SIZE)
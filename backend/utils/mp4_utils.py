@@ -0,0 +1,233 @@
+# backend/utils/mp4_utils.py
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import config
+
+# ---------------------------
+# Config
+# ---------------------------
+MP4_EXTENSIONS = {".mp4", ".m4v", ".m4a", ".m4b", ".mov", ".3gp", ".3g2"}
+
+# Boxes that have to be descended into to reach stco/co64 chunk offset tables
+CONTAINER_BOXES = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+
+_layout_cache = OrderedDict()  # real path -> (mtime_ns, size, Mp4Layout | None)
+_layout_lock = threading.Lock()
+_layout_resident = 0  # In-memory bytes held by cached layouts
+
+# ---------------------------
+# Box parsing
+# ---------------------------
+
+def is_mp4(path: Path) -> bool:
+    """Check if the file looks like an ISO base media (MP4/MOV) file by extension."""
+    return path.suffix.lower() in MP4_EXTENSIONS
+
+def _parse_box_header(data: bytes, offset: int, end: int):
+    """
+    Parse a box header at `offset` inside `data`.
+    Returns (box_type, box_size, header_size). A size of 0 means "up to `end`".
+    """
+    if offset + 8 > end:
+        raise ValueError("Truncated box header")
+    size, box_type = struct.unpack_from(">I4s", data, offset)
+    header_size = 8
+    if size == 1:
+        if offset + 16 > end:
+            raise ValueError("Truncated 64-bit box header")
+        size, = struct.unpack_from(">Q", data, offset + 8)
+        header_size = 16
+    elif size == 0:
+        size = end - offset
+    if size < header_size or offset + size > end:
+        raise ValueError(f"Invalid size for box '{box_type.decode('latin-1')}'")
+    return box_type, size, header_size
+
+def read_top_level_boxes(f, file_size: int) -> list:
+    """Return a list of (box_type, offset, size) for every top-level box in an open file."""
+    boxes = []
+    offset = 0
+    while offset < file_size:
+        f.seek(offset)
+        header = f.read(16)
+        if len(header) < 8:
+            raise ValueError("Truncated box header")
+        size, box_type = struct.unpack_from(">I4s", header)
+        header_size = 8
+        if size == 1:
+            if len(header) < 16:
+                raise ValueError("Truncated 64-bit box header")
+            size, = struct.unpack_from(">Q", header, 8)
+            header_size = 16
+        elif size == 0:
+            size = file_size - offset  # Box runs to EOF
+        if size < header_size or offset + size > file_size:
+            raise ValueError(f"Invalid size for box '{box_type.decode('latin-1')}'")
+        boxes.append((box_type, offset, size))
+        offset += size
+    return boxes
+
+def _patch_chunk_offsets(buf: bytearray, start: int, end: int, shift_from: int, shift_to: int, delta: int):
+    """
+    Walk boxes in buf[start:end] and add `delta` to every stco/co64 chunk offset
+    that falls inside [shift_from, shift_to). Modifies buf in place.
+    """
+    offset = start
+    while offset < end:
+        box_type, size, header_size = _parse_box_header(buf, offset, end)
+        body = offset + header_size
+        if box_type in CONTAINER_BOXES:
+            _patch_chunk_offsets(buf, body, offset + size, shift_from, shift_to, delta)
+        elif box_type in (b"stco", b"co64"):
+            # Full box: version(1) + flags(3) + entry_count(4) + entries
+            entry_count, = struct.unpack_from(">I", buf, body + 4)
+            code, width = ("I", 4) if box_type == b"stco" else ("Q", 8)
+            table = body + 8
+            if table + entry_count * width > offset + size:
+                raise ValueError(f"Truncated '{box_type.decode()}' table")
+            fmt = f">{entry_count}{code}"
+            values = [
+                value + delta if shift_from <= value < shift_to else value
+                for value in struct.unpack_from(fmt, buf, table)
+            ]
+            try:
+                struct.pack_into(fmt, buf, table, *values)
+            except struct.error:
+                raise ValueError("Chunk offset overflows 32-bit 'stco' table")
+        elif box_type == b"cmov":
+            raise ValueError("Compressed 'moov' boxes are not supported")
+        offset += size
+
+# ---------------------------
+# Virtual layout
+# ---------------------------
+
+class Mp4Layout:
+    """
+    A virtual, fast-start view of an MP4 file.
+    The file is described as an ordered list of segments; each segment is either
+    a (offset, length) range of the original file or an in-memory bytes buffer
+    (the rewritten 'moov' box). The original file is never modified.
+    """
+
+    def __init__(self, path: Path, segments: list):
+        self.path = path
+        self.segments = segments
+        self.size = sum(length for _, length in segments)
+        self.resident_bytes = sum(length for source, length in segments if isinstance(source, (bytes, bytearray)))
+
+    def iter_range(self, start: int, length: int, chunk_size: int):
+        """Yield `length` bytes of the virtual file starting at `start`, in chunks."""
+        remaining = length
+        pos = 0
+        with open(self.path, "rb") as f:
+            for source, seg_len in self.segments:
+                if remaining <= 0:
+                    break
+                if start >= pos + seg_len:
+                    pos += seg_len
+                    continue
+                inner = max(start - pos, 0)
+                take = min(seg_len - inner, remaining)
+                if isinstance(source, (bytes, bytearray)):
+                    for i in range(inner, inner + take, chunk_size):
+                        yield bytes(source[i:min(i + chunk_size, inner + take)])
+                else:
+                    f.seek(source + inner)
+                    left = take
+                    while left > 0:
+                        chunk = f.read(min(chunk_size, left))
+                        if not chunk:
+                            return
+                        left -= len(chunk)
+                        yield chunk
+                remaining -= take
+                pos += seg_len
+
+def build_faststart_layout(path: Path):
+    """
+    Parse the top-level boxes of an MP4 file and, if 'moov' sits after the first
+    'mdat', return an Mp4Layout with 'moov' moved in front of the media data and
+    its chunk offsets rewritten. Returns None if the file is already fast-start
+    or cannot be handled safely.
+    """
+    file_size = path.stat().st_size
+    with open(path, "rb") as f:
+        try:
+            boxes = read_top_level_boxes(f, file_size)
+        except (ValueError, struct.error):
+            return None
+
+        types = [box_type for box_type, _, _ in boxes]
+        if b"moov" not in types or b"mdat" not in types or b"moof" in types:
+            return None
+        moov_index = types.index(b"moov")
+        mdat_index = types.index(b"mdat")
+        if moov_index < mdat_index:
+            return None  # Already fast-start
+
+        _, moov_start, moov_size = boxes[moov_index]
+        _, mdat_start, _ = boxes[mdat_index]
+        if moov_size > config.MP4_MAX_MOOV_SIZE:
+            return None
+
+        f.seek(moov_start)
+        moov = bytearray(f.read(moov_size))
+        if len(moov) != moov_size:
+            return None
+
+    # Everything between the first 'mdat' and 'moov' moves forward by the size of 'moov'
+    try:
+        _, _, header_size = _parse_box_header(moov, 0, moov_size)
+        if struct.unpack_from(">I", moov)[0] == 0:
+            struct.pack_into(">I", moov, 0, moov_size)  # "Runs to EOF" no longer holds once moved
+        _patch_chunk_offsets(moov, header_size, moov_size, mdat_start, moov_start, moov_size)
+    except (ValueError, struct.error):
+        return None
+
+    moov_end = moov_start + moov_size
+    segments = [
+        (0, mdat_start),
+        (bytes(moov), moov_size),
+        (mdat_start, moov_start - mdat_start),
+        (moov_end, file_size - moov_end),
+    ]
+    return Mp4Layout(path, [(source, length) for source, length in segments if length > 0])
+
+def _layout_bytes(entry) -> int:
+    return entry[2].resident_bytes if entry and entry[2] else 0
+
+def get_faststart_layout(path: Path):
+    """
+    Return a cached fast-start Mp4Layout for `path`, or None if the file does not
+    need (or support) remuxing. The cache is keyed by path, invalidated on mtime/size,
+    and bounded by entry count and by the total size of the rewritten 'moov' boxes.
+    """
+    global _layout_resident
+    if not config.MP4_FASTSTART or not is_mp4(path):
+        return None
+
+    stat = path.stat()
+    key = str(path)
+    with _layout_lock:
+        cached = _layout_cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _layout_cache.move_to_end(key)
+            return cached[2]
+
+    layout = build_faststart_layout(path)
+    entry = (stat.st_mtime_ns, stat.st_size, layout)
+    if _layout_bytes(entry) > config.MP4_LAYOUT_CACHE_BYTES:
+        return layout  # Too large to keep: serve it, but don't flush the cache for it
+
+    with _layout_lock:
+        _layout_resident -= _layout_bytes(_layout_cache.pop(key, None))
+        _layout_cache[key] = entry
+        _layout_resident += _layout_bytes(entry)
+        while (len(_layout_cache) > config.MP4_LAYOUT_CACHE_SIZE
+               or _layout_resident > config.MP4_LAYOUT_CACHE_BYTES):
+            _, evicted = _layout_cache.popitem(last=False)
+            _layout_resident -= _layout_bytes(evicted)
+    return layout
@@ -0,0 +1,110 @@
+# backend/utils/offload_utils.py
+"""
+Run blocking work (hashing, delta generation, directory walks) on native
+threads without stalling the server.
+
+Under eventlet every request and socket handler is a green thread sharing one
+hub thread, and nothing is monkey-patched, so a long CPU- or disk-bound call
+made directly in a handler freezes every other stream and socket. These helpers
+hand the work to a real thread pool and wait with a cooperative sleep
+(`socketio.sleep`, installed by app.py via set_sleep) instead of blocking.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import config
+
+# ---------------------------
+# Config
+# ---------------------------
+POLL_INTERVAL = 0.01  # Seconds between checks while waiting on a native thread
+STREAM_BUFFER_SIZE = 256 * 1024  # Small generator items are batched up to this size
+STREAM_QUEUE_SIZE = 16  # Batches buffered ahead of the consumer
+
+executor = ThreadPoolExecutor(max_workers=config.OFFLOAD_WORKERS)
+
+_sleep = time.sleep
+_DONE = object()
+
+
+def set_sleep(sleep_fn):
+    """Use `sleep_fn` (e.g. socketio.sleep) while waiting, so green threads keep running."""
+    global _sleep
+    _sleep = sleep_fn
+
+
+def run_blocking(fn, *args, poll=None, **kwargs):
+    """
+    Run fn(*args, **kwargs) on a native thread and return its result (or raise its error).
+    `poll`, if given, is called between checks from the waiting thread, e.g. to emit queued progress.
+    """
+    future = executor.submit(fn, *args, **kwargs)
+    while not future.done():
+        if poll:
+            poll()
+        _sleep(POLL_INTERVAL)
+    if poll:
+        poll()
+    return future.result()
+
+
+def wait_done(future, timeout: float) -> bool:
+    """Wait up to `timeout` seconds for a future without blocking the event loop; return whether it finished."""
+    deadline = time.monotonic() + timeout
+    while not future.done() and time.monotonic() < deadline:
+        _sleep(POLL_INTERVAL)
+    return future.done()
+
+
+def iter_blocking(gen):
+    """
+    Iterate a bytes generator on a native thread, yielding batches of its output.
+    Stops the producer if the consumer goes away (e.g. the client disconnects).
+    """
+    batches = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    cancelled = threading.Event()
+
+    def put(item):
+        while not cancelled.is_set():
+            try:
+                batches.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            pending = []
+            pending_size = 0
+            for item in gen:
+                pending.append(item)
+                pending_size += len(item)
+                if pending_size >= STREAM_BUFFER_SIZE:
+                    if not put(b"".join(pending)):
+                        return
+                    pending, pending_size = [], 0
+            if pending and not put(b"".join(pending)):
+                return
+            put(_DONE)
+        except BaseException as e:
+            put(e)
+        finally:
+            gen.close()
+
+    executor.submit(produce)
+    try:
+        while True:
+            try:
+                item = batches.get_nowait()
+            except queue.Empty:
+                _sleep(POLL_INTERVAL)
+                continue
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        cancelled.set()
@@ -2,11 +2,16 @@
 import mimetypes
 from pathlib import Path
 from flask import Response, request, abort
+from .mp4_utils import get_faststart_layout
+from .hot_cache import hot_cache
 
 # ---------------------------
 # Config
 # ---------------------------
 CHUNK_SIZE = 8 * 1024 * 1024  # 1 MB per chunk
+TEXT_SNIFF_SIZE = 8 * 1024  # Bytes checked for NUL when the MIME type doesn't say "text"
+TEXT_MIME_TYPES = {"application/json", "application/xml", "application/javascript",
+                   "application/x-sh", "application/x-yaml", "application/toml"}
 
 # ---------------------------
 # File type helpers
@@ -32,6 +37,23 @@ def is_image(path: Path) -> bool:
     mime = get_mime_type(path)
     return mime.startswith("image/")
 
+def is_text(path: Path) -> bool:
+    """
+    Check if file is text.
+    Trusts 'text/*' and common text-based application types; otherwise (e.g.
+    '.log' or rotated 'app.log.1') sniffs the first block for NUL bytes.
+    """
+    mime = get_mime_type(path)
+    if mime.startswith("text/") or mime in TEXT_MIME_TYPES:
+        return True
+    if mime != "application/octet-stream":
+        return False
+    try:
+        with open(path, "rb") as f:
+            return b"\0" not in f.read(TEXT_SNIFF_SIZE)
+    except OSError:
+        return False
+
 # ---------------------------
 # Streaming helpers
 # ---------------------------
@@ -60,9 +82,14 @@ def stream_file_response(file_path: Path):
     """
     Return a Flask Response streaming a file in chunks.
     Supports HTTP Range headers for seeking.
+    MP4 files with 'moov' at the end are served as a virtual fast-start file.
+    Small files are served from the in-memory hot-file cache as a single buffer.
     """
     mime_type = get_mime_type(file_path)
-    file_size = file_path.stat().st_size
+    stat = file_path.stat()
+    layout = get_faststart_layout(file_path)
+    data = hot_cache.get(file_path, stat) if not layout else None
+    file_size = layout.size if layout else len(data) if data is not None else stat.st_size
 
     range_header = request.headers.get("Range", None)
     if range_header:
@@ -73,6 +100,9 @@ def stream_file_response(file_path: Path):
         length = end - start + 1
 
         def partial_stream():
+            if layout:
+                yield from layout.iter_range(start, length, CHUNK_SIZE)
+                return
             with open(file_path, "rb") as f:
                 f.seek(start)
                 remaining = length
@@ -83,7 +113,8 @@ def stream_file_response(file_path: Path):
                     remaining -= len(chunk)
                     yield chunk
 
-        resp = Response(partial_stream(), status=206, mimetype=mime_type)
+        body = data[start:end + 1] if data is not None else partial_stream()
+        resp = Response(body, status=206, mimetype=mime_type)
         resp.headers.update({
             "Content-Range": f"bytes {start}-{end}/{file_size}",
             "Accept-Ranges": "bytes",
@@ -93,8 +124,15 @@ def stream_file_response(file_path: Path):
         return resp
 
     # Full file response
-    resp = Response(file_stream_generator(file_path), mimetype=mime_type)
+    if data is not None:
+        body = data
+    elif layout:
+        body = layout.iter_range(0, file_size, CHUNK_SIZE)
+    else:
+        body = file_stream_generator(file_path)
+    resp = Response(body, mimetype=mime_type)
     resp.headers.update({
+        "Accept-Ranges": "bytes",
         "Content-Length": str(file_size),
         "Content-Disposition": f'inline; filename="{file_path.name}"'
     })
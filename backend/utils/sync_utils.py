@@ -0,0 +1,226 @@
+# backend/utils/sync_utils.py
+"""
+rsync-style delta sync helpers.
+
+A file is described by block signatures: for every `block_size` block, a weak
+rolling checksum (Adler-32, as returned by zlib.adler32) and a strong hash
+(16-byte BLAKE2b). Given the signatures of a client's old copy, the server
+slides a window over its current file and streams a delta made of:
+
+    b"C" + >QI (first block index, block count)   copy blocks from the old copy
+    b"L" + >I (length) + bytes                    literal data
+    b"E" + >Q (total size) + 32-byte SHA-256      end of delta, for verification
+"""
+import hashlib
+import math
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+import config
+
+# ---------------------------
+# Config
+# ---------------------------
+READ_SIZE = 4 * 1024 * 1024  # Bytes read from disk at a time
+MAX_LITERAL = 1024 * 1024  # Flush literal runs at this size
+ROLL_INTERVAL_BLOCKS = 8  # Blocks sent without rolling between rolled blocks in long unmatched regions
+MIN_BLOCK_SIZE = 4 * 1024
+MAX_BLOCK_SIZE = 8 * 1024 * 1024
+ADLER_MOD = 65521
+
+OP_COPY = b"C"
+OP_LITERAL = b"L"
+OP_END = b"E"
+
+_signature_cache = OrderedDict()  # (real path, block_size) -> (mtime_ns, size, signature dict)
+_signature_lock = threading.Lock()
+
+# ---------------------------
+# Signatures
+# ---------------------------
+
+def choose_block_size(file_size: int) -> int:
+    """Pick a power-of-two block size close to sqrt(file_size), like rsync does."""
+    if file_size <= 0:
+        return MIN_BLOCK_SIZE
+    size = 1 << max(0, math.isqrt(file_size) - 1).bit_length()
+    return max(MIN_BLOCK_SIZE, min(MAX_BLOCK_SIZE, size))
+
+def validate_block_size(block_size: int) -> int:
+    if not MIN_BLOCK_SIZE <= block_size <= MAX_BLOCK_SIZE:
+        raise ValueError(f"block_size must be between {MIN_BLOCK_SIZE} and {MAX_BLOCK_SIZE}")
+    return block_size
+
+def strong_checksum(block) -> str:
+    return hashlib.blake2b(block, digest_size=16).hexdigest()
+
+def compute_signatures(file_path: Path, block_size: int) -> list:
+    """Return [[weak, strong], ...] for every block of the file."""
+    blocks = []
+    with open(file_path, "rb") as f:
+        while block := f.read(block_size):
+            blocks.append([zlib.adler32(block), strong_checksum(block)])
+    return blocks
+
+def get_signatures(file_path: Path, block_size: int | None = None) -> dict:
+    """
+    Return the block signatures of a file, cached per (path, block_size).
+    The cached value is reused until the file's mtime or size changes.
+    """
+    stat = file_path.stat()
+    block_size = validate_block_size(block_size) if block_size is not None else choose_block_size(stat.st_size)
+    key = (str(file_path), block_size)
+    with _signature_lock:
+        cached = _signature_cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _signature_cache.move_to_end(key)
+            return cached[2]
+
+    signature = {
+        "size": stat.st_size,
+        "block_size": block_size,
+        "blocks": compute_signatures(file_path, block_size),
+    }
+
+    with _signature_lock:
+        _signature_cache[key] = (stat.st_mtime_ns, stat.st_size, signature)
+        _signature_cache.move_to_end(key)
+        while len(_signature_cache) > config.SYNC_SIGNATURE_CACHE_SIZE:
+            _signature_cache.popitem(last=False)
+    return signature
+
+# ---------------------------
+# Delta generation
+# ---------------------------
+
+def _build_table(blocks: list) -> dict:
+    """Map weak checksum -> {strong checksum: first block index}."""
+    table = {}
+    try:
+        for index, (weak, strong) in enumerate(blocks):
+            table.setdefault(int(weak), {}).setdefault(str(strong), index)
+    except (TypeError, ValueError):
+        raise ValueError("Block signatures must be [weak, strong] pairs")
+    return table
+
+def _encode_literal(data) -> bytes:
+    return OP_LITERAL + struct.pack(">I", len(data)) + bytes(data)
+
+def generate_delta(file_path: Path, blocks: list, block_size: int):
+    """
+    Return a generator of the delta that turns a file with signatures `blocks`
+    into `file_path`. Arguments are validated up front (ValueError), so errors
+    surface before a response starts streaming.
+    """
+    validate_block_size(block_size)
+    return _delta_stream(file_path, _build_table(blocks), block_size)
+
+def _delta_stream(file_path: Path, table: dict, block_size: int):
+    """
+    Matched blocks are skipped in one step; the Adler-32 window is only rolled
+    byte by byte through regions that changed, and only sparsely through long ones.
+    """
+    sha256 = hashlib.sha256()
+    total = 0
+    copy_start, copy_count = None, 0
+
+    buf = bytearray()
+    pos = 0  # Start of the current window in buf
+    lit = 0  # Start of the pending literal run in buf
+    eof = False
+    weak = None
+    miss_run = 0  # Bytes since the last matched block
+    skipped = 0  # Blocks jumped since the last rolled block
+
+    with open(file_path, "rb") as f:
+        while True:
+            # Keep at least one block plus the next byte in the buffer
+            while not eof and len(buf) - pos <= block_size:
+                if lit > 0:
+                    del buf[:lit]
+                    pos -= lit
+                    lit = 0
+                chunk = f.read(READ_SIZE)
+                if chunk:
+                    buf += chunk
+                    sha256.update(chunk)
+                    total += len(chunk)
+                else:
+                    eof = True
+
+            n = min(block_size, len(buf) - pos)
+            if n <= 0:
+                break
+            if weak is None or n < block_size:
+                weak = zlib.adler32(buf[pos:pos + n])
+
+            candidates = table.get(weak)
+            index = candidates.get(strong_checksum(buf[pos:pos + n])) if candidates else None
+            if index is not None:
+                if pos > lit:
+                    if copy_count:
+                        yield OP_COPY + struct.pack(">QI", copy_start, copy_count)
+                        copy_count = 0
+                    yield _encode_literal(buf[lit:pos])
+                if copy_count and index == copy_start + copy_count:
+                    copy_count += 1
+                else:
+                    if copy_count:
+                        yield OP_COPY + struct.pack(">QI", copy_start, copy_count)
+                    copy_start, copy_count = index, 1
+                pos += n
+                lit = pos
+                weak = None
+                miss_run = skipped = 0
+                continue
+
+            if n < block_size:
+                # Unmatched tail shorter than a block: the rest is literal
+                pos = len(buf)
+                break
+            if pos + n >= len(buf):
+                # Window ends at EOF: slide into the tail
+                pos += 1
+                weak = None
+                continue
+
+            if miss_run >= MAX_LITERAL and skipped < ROLL_INTERVAL_BLOCKS:
+                # Long unmatched region: send whole blocks as literals, only checking aligned windows
+                pos += n
+                miss_run += n
+                skipped += 1
+                weak = None
+            else:
+                # Roll the window byte by byte until the weak checksum hits or the buffer runs out.
+                # Once MAX_LITERAL bytes went unmatched, roll through at most one block at a time,
+                # which bounds the pure-Python work while still resyncing after the changed region.
+                a, b = weak & 0xFFFF, weak >> 16
+                rolled_from = pos
+                limit = min(len(buf) - n, lit + MAX_LITERAL)
+                if miss_run >= MAX_LITERAL:
+                    limit = min(limit, pos + n)
+                while pos < limit:
+                    out_byte, in_byte = buf[pos], buf[pos + n]
+                    a = (a - out_byte + in_byte) % ADLER_MOD
+                    b = (b - n * out_byte + a - 1) % ADLER_MOD
+                    pos += 1
+                    if ((b << 16) | a) in table:
+                        break
+                weak = (b << 16) | a
+                miss_run += pos - rolled_from
+                skipped = 0
+
+            if pos - lit >= MAX_LITERAL:
+                if copy_count:
+                    yield OP_COPY + struct.pack(">QI", copy_start, copy_count)
+                    copy_count = 0
+                yield _encode_literal(buf[lit:pos])
+                lit = pos
+
+    if copy_count:
+        yield OP_COPY + struct.pack(">QI", copy_start, copy_count)
+    if pos > lit:
+        yield _encode_literal(buf[lit:pos])
+    yield OP_END + struct.pack(">Q", total) + sha256.digest()
@@ -0,0 +1,355 @@
+# backend/utils/text_utils.py
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import config
+
+# ---------------------------
+# Config
+# ---------------------------
+SCAN_CHUNK_SIZE = 4 * 1024 * 1024  # Bytes read at a time while indexing
+TAIL_BLOCK_SIZE = 64 * 1024  # Bytes read at a time when scanning backwards from EOF
+FOLLOW_MAX_BYTES = 1024 * 1024  # Most bytes read per follow tick
+MAX_LINE_LENGTH = 64 * 1024  # Longer lines are truncated in responses
+TAIL_SIGNATURE_SIZE = 64  # Bytes before the indexed end used to detect rewrites
+
+executor = ThreadPoolExecutor(max_workers=2)
+
+_indexes = OrderedDict()  # real path -> LineIndex, most recently used last
+_indexes_lock = threading.Lock()
+_building = set()  # real paths with a background build in progress
+
+# ---------------------------
+# Line index
+# ---------------------------
+
+class LineIndex:
+    """
+    Sparse line-offset index of a text file.
+    checkpoints[k] is the byte offset where line k * interval starts (0-based),
+    for the first `indexed_bytes` bytes of the file. Appends extend the index
+    incrementally; anything else (truncation, rewrite, new inode) rebuilds it.
+    """
+
+    def __init__(self, path: Path, interval: int):
+        self.path = path
+        self.interval = interval
+        self.inode = None
+        self.mtime_ns = None
+        self.indexed_bytes = 0
+        self.line_count = 0  # Newlines seen in the indexed bytes
+        self.checkpoints = [0]
+        self.tail_signature = ""
+        self.lock = threading.Lock()
+
+    # Persistence
+
+    @staticmethod
+    def index_file(path: Path) -> Path:
+        name = hashlib.sha1(str(path).encode("utf-8", "surrogateescape")).hexdigest()
+        return Path(config.CACHE_DIR) / "text_index" / f"{name}.json"
+
+    @classmethod
+    def load(cls, path: Path, interval: int) -> "LineIndex":
+        index = cls(path, interval)
+        try:
+            with open(cls.index_file(path), "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved["path"] == str(path) and saved["interval"] == interval:
+                index.inode = saved["inode"]
+                index.mtime_ns = saved["mtime_ns"]
+                index.indexed_bytes = saved["indexed_bytes"]
+                index.line_count = saved["line_count"]
+                index.checkpoints = saved["checkpoints"]
+                index.tail_signature = saved["tail_signature"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return index
+
+    def save(self):
+        target = self.index_file(self.path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            state = {
+                "path": str(self.path),
+                "interval": self.interval,
+                "inode": self.inode,
+                "mtime_ns": self.mtime_ns,
+                "indexed_bytes": self.indexed_bytes,
+                "line_count": self.line_count,
+                "checkpoints": self.checkpoints,
+                "tail_signature": self.tail_signature,
+            }
+        tmp = target.with_name(target.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, target)
+
+    # Freshness
+
+    def _signature(self, f, end: int) -> str:
+        start = max(0, end - TAIL_SIGNATURE_SIZE)
+        f.seek(start)
+        return hashlib.sha1(f.read(end - start)).hexdigest()
+
+    def is_current(self, stat: os.stat_result) -> bool:
+        return (self.inode == stat.st_ino and self.mtime_ns == stat.st_mtime_ns
+                and self.indexed_bytes == stat.st_size)
+
+    def _reset(self):
+        self.indexed_bytes = 0
+        self.line_count = 0
+        self.checkpoints = [0]
+        self.tail_signature = ""
+
+    def update(self):
+        """Bring the index up to date with the file, extending it if the file only grew."""
+        stat = self.path.stat()
+        if self.is_current(stat):
+            return
+        with open(self.path, "rb") as f:
+            with self.lock:
+                appended = (self.inode == stat.st_ino and stat.st_size >= self.indexed_bytes
+                            and self._signature(f, self.indexed_bytes) == self.tail_signature)
+                if not appended:
+                    self._reset()
+                self.inode = stat.st_ino
+
+            offset = self.indexed_bytes
+            f.seek(offset)
+            while offset < stat.st_size:
+                chunk = f.read(min(SCAN_CHUNK_SIZE, stat.st_size - offset))
+                if not chunk:
+                    break
+                self._index_chunk(chunk, offset)
+                offset += len(chunk)
+
+            with self.lock:
+                self.tail_signature = self._signature(f, self.indexed_bytes)
+                self.mtime_ns = stat.st_mtime_ns
+
+    def _index_chunk(self, chunk: bytes, offset: int):
+        line_count = self.line_count
+        new_checkpoints = []
+        next_line = (len(self.checkpoints)) * self.interval
+        start = 0
+        while True:
+            needed = next_line - line_count
+            available = chunk.count(b"\n", start)
+            if available < needed:
+                line_count += available
+                break
+            pos = start - 1
+            for _ in range(needed):
+                pos = chunk.index(b"\n", pos + 1)
+            line_count += needed
+            new_checkpoints.append(offset + pos + 1)
+            next_line += self.interval
+            start = pos + 1
+        with self.lock:
+            self.checkpoints.extend(new_checkpoints)
+            self.line_count = line_count
+            self.indexed_bytes = offset + len(chunk)
+
+    def seek_point(self, line: int) -> tuple:
+        """Return (line number, byte offset) of the nearest checkpoint at or before `line`."""
+        with self.lock:
+            k = min(line // self.interval, len(self.checkpoints) - 1)
+            return k * self.interval, self.checkpoints[k]
+
+    def total_lines(self, stat: os.stat_result) -> int | None:
+        """Total number of lines, if the whole file has been indexed."""
+        file_size = stat.st_size
+        with self.lock:
+            if not self.is_current(stat):
+                return None
+            if file_size == 0:
+                return 0
+            with open(self.path, "rb") as f:
+                f.seek(file_size - 1)
+                trailing_partial = f.read(1) != b"\n"
+            return self.line_count + (1 if trailing_partial else 0)
+
+def get_line_index(path: Path) -> LineIndex:
+    """Return the in-memory index for a file (loaded from disk on first use), without building it."""
+    key = str(path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = LineIndex.load(path, config.TEXT_INDEX_INTERVAL)
+            _indexes[key] = index
+            while len(_indexes) > config.TEXT_INDEX_CACHE_SIZE:
+                _indexes.popitem(last=False)
+        _indexes.move_to_end(key)
+        return index
+
+def build_line_index_async(path: Path) -> LineIndex:
+    """Return the index for a file, scheduling a background update if it is stale."""
+    index = get_line_index(path)
+    if index.is_current(path.stat()):
+        return index
+
+    key = str(path)
+    with _indexes_lock:
+        if key in _building:
+            return index
+        _building.add(key)
+
+    def task():
+        try:
+            index.update()
+            index.save()
+        except OSError:
+            pass
+        finally:
+            with _indexes_lock:
+                _building.discard(key)
+
+    executor.submit(task)
+    return index
+
+# ---------------------------
+# Reading lines
+# ---------------------------
+
+def _decode(line: bytes) -> str:
+    return line[:MAX_LINE_LENGTH].rstrip(b"\r\n").decode("utf-8", errors="replace")
+
+def _split_lines(data: bytes) -> list:
+    """Split on b"\n" only (matching the index); a trailing newline doesn't start a new line."""
+    parts = data.split(b"\n")
+    if parts and parts[-1] == b"":
+        parts.pop()
+    return parts
+
+def _read_line(f) -> bytes:
+    """Read one line, truncating it to MAX_LINE_LENGTH but always consuming it fully."""
+    line = f.readline(MAX_LINE_LENGTH)
+    if len(line) == MAX_LINE_LENGTH and not line.endswith(b"\n"):
+        while (rest := f.readline(MAX_LINE_LENGTH)) and not rest.endswith(b"\n"):
+            pass
+    return line
+
+def read_lines(path: Path, start: int, count: int) -> dict:
+    """
+    Return `count` lines starting at 0-based line `start`.
+    Seeks to the nearest indexed checkpoint and reads forward from there,
+    so only the bytes between that checkpoint and the last line are read.
+    If `start` lies beyond the indexed part of the file and isn't reached within
+    one scan chunk, returns an indexing status with progress instead of scanning
+    on; the background build keeps going and the client can retry.
+    """
+    index = build_line_index_async(path)
+    line, offset = index.seek_point(start)
+    stat = path.stat()
+    file_size = stat.st_size
+
+    with index.lock:
+        indexed_lines, indexed_bytes = index.line_count, index.indexed_bytes
+    scan_limit = None
+    if start > indexed_lines and not index.is_current(stat):
+        scan_limit = offset + SCAN_CHUNK_SIZE
+
+    lines = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while line < start and _read_line(f):
+            line += 1
+            if scan_limit is not None and f.tell() > scan_limit:
+                return {
+                    "start": start,
+                    "indexing": True,
+                    "indexed_lines": indexed_lines,
+                    "indexed_bytes": indexed_bytes,
+                    "size": file_size,
+                    "percent": indexed_bytes / file_size * 100.0,
+                }
+        while len(lines) < count and (raw := _read_line(f)):
+            lines.append(_decode(raw))
+        end_offset = f.tell()
+
+    return {
+        "start": start,
+        "lines": lines,
+        "next_line": start + len(lines),
+        "eof": end_offset >= file_size,
+        "offset": end_offset,
+        "size": file_size,
+        "total_lines": index.total_lines(stat),
+    }
+
+def tail_lines(path: Path, count: int, partial: bool = True) -> dict:
+    """
+    Return the last `count` lines, reading backwards from EOF.
+    At most (count + 1) * MAX_LINE_LENGTH bytes are read, so a file with few or no
+    newlines can't make this scan the whole file. `offset` is where the last complete
+    line ends, i.e. where a follower should continue reading; with partial=False a
+    trailing line that has no newline yet is left out (it arrives once completed).
+    """
+    index = build_line_index_async(path)
+    stat = path.stat()
+    file_size = stat.st_size
+    max_bytes = (count + 1) * MAX_LINE_LENGTH
+
+    blocks = []
+    newlines = 0
+    position = file_size
+    with open(path, "rb") as f:
+        # One extra newline is needed to know where the first wanted line starts
+        while position > 0 and newlines <= count and file_size - position < max_bytes:
+            step = min(TAIL_BLOCK_SIZE, position)
+            position -= step
+            f.seek(position)
+            block = f.read(step)
+            newlines += block.count(b"\n")
+            blocks.append(block)
+    data = b"".join(reversed(blocks))
+
+    last_newline = data.rfind(b"\n")
+    if last_newline >= 0:
+        offset = position + last_newline + 1
+    else:
+        offset = 0 if position == 0 else file_size  # No line boundary within reach: follow from EOF
+
+    raw_lines = _split_lines(data)
+    if position > 0:
+        raw_lines = raw_lines[1:]  # First entry is the tail of an earlier line
+    dropped = 0
+    if not partial and raw_lines and not data.endswith(b"\n"):
+        raw_lines.pop()
+        dropped = 1
+    raw_lines = raw_lines[-count:] if count else []
+
+    total = index.total_lines(stat)
+    return {
+        "start": total - len(raw_lines) - dropped if total is not None else None,
+        "lines": [_decode(raw) for raw in raw_lines],
+        "eof": True,
+        "offset": offset,
+        "size": file_size,
+        "total_lines": total,
+    }
+
+def read_appended(path: Path, offset: int) -> tuple:
+    """
+    Read complete lines appended after `offset` (at most FOLLOW_MAX_BYTES per call).
+    Returns (lines, new_offset). If the file shrank, returns (None, 0).
+    """
+    size = path.stat().st_size
+    if size < offset:
+        return None, 0
+    if size == offset:
+        return [], offset
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(min(FOLLOW_MAX_BYTES, size - offset))
+    end = data.rfind(b"\n") + 1
+    if end == 0:
+        if len(data) < FOLLOW_MAX_BYTES:
+            return [], offset  # Wait for the rest of the line
+        end = len(data)  # Oversized line: send what we have
+    return [_decode(raw) for raw in _split_lines(data[:end])], offset + end
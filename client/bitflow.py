@@ -0,0 +1,701 @@
+# client/bitflow.py
+"""
+BitFlow command-line download client.
+
+Downloads files (or whole directories) from a BitFlow server using several
+parallel HTTP Range segments per file and several files at once. Progress is
+kept in a small state file next to the download, so an interrupted transfer
+picks up where it stopped as long as the remote file has not changed.
+
+It can also keep a local copy of a large, slowly changing file up to date
+with rsync-style delta sync, transferring only the blocks that changed.
+
+Usage:
+    python bitflow.py download http://192.168.1.5:8888 /Videos/movie.mp4 -o ~/Downloads
+    python bitflow.py download http://192.168.1.5:8888 /Photos -s 8 -j 4 --verify
+    python bitflow.py sync http://192.168.1.5:8888 /VMs/disk.qcow2 ~/mirror/disk.qcow2
+
+Only the Python standard library is required, so this file can be copied
+anywhere and also imported as a module (see BitFlowClient).
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import hashlib
+import http.client
+import math
+import struct
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+# ---------------------------
+# Config
+# ---------------------------
+CHUNK_SIZE = 1024 * 1024  # 1 MB per read from the socket
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024  # Don't split files into segments smaller than 4 MB
+STATE_SAVE_INTERVAL = 2.0  # Seconds between state file writes
+CHECKSUM_POLL_INTERVAL = 2.0  # Seconds between polls while the server hashes a large file
+DEFAULT_SEGMENTS = 4
+DEFAULT_JOBS = 2
+DEFAULT_RETRIES = 5
+DEFAULT_TIMEOUT = 30
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".bitflow"
+SYNC_SUFFIX = ".bitflow-sync"
+SYNC_READ_SIZE = 4 * 1024 * 1024
+MIN_SYNC_BLOCK_SIZE = 4 * 1024
+MAX_SYNC_BLOCK_SIZE = 8 * 1024 * 1024
+ADLER_MOD = 65521
+SYNC_MAX_MISS = 1024 * 1024  # Unmatched bytes after which the window is rolled only sparsely
+ROLL_INTERVAL_BLOCKS = 8  # Blocks skipped without rolling between rolled blocks past SYNC_MAX_MISS
+
+# ---------------------------
+# Errors
+# ---------------------------
+
+class BitFlowError(Exception):
+    """Base error for client failures."""
+
+class FileChangedError(BitFlowError):
+    """The remote file changed while (or since) it was being downloaded."""
+
+class ChecksumMismatchError(BitFlowError):
+    """The downloaded file does not match the server-side checksum."""
+
+class TransferCancelledError(BitFlowError):
+    """The transfer was cancelled (e.g. Ctrl-C); its progress is saved for resuming."""
+
+# ---------------------------
+# HTTP client
+# ---------------------------
+
+class BitFlowClient:
+    """Thin wrapper over the BitFlow HTTP API."""
+
+    def __init__(self, base_url: str, timeout: float = DEFAULT_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def url(self, endpoint: str, **params) -> str:
+        query = urllib.parse.urlencode(params)
+        return f"{self.base_url}{endpoint}?{query}" if query else f"{self.base_url}{endpoint}"
+
+    def open(self, endpoint: str, method: str = "GET", headers: dict | None = None, data: bytes | None = None, **params):
+        req = urllib.request.Request(self.url(endpoint, **params), method=method,
+                                     headers=headers or {}, data=data)
+        return urllib.request.urlopen(req, timeout=self.timeout)
+
+    def _load_json(self, endpoint: str, **params) -> dict:
+        try:
+            with self.open(endpoint, **params) as resp:
+                return json.load(resp)
+        except urllib.error.HTTPError as e:
+            try:
+                return json.load(e)
+            except Exception:
+                raise BitFlowError(f"{endpoint}: HTTP {e.code}") from e
+
+    def get_json(self, endpoint: str, **params) -> dict:
+        payload = self._load_json(endpoint, **params)
+        if payload.get("status") != "success":
+            raise BitFlowError(payload.get("message", f"{endpoint} failed"))
+        return payload
+
+    def list_dir(self, path: str) -> dict:
+        """Return the listing for a logical path (same shape as the 'list_dir' socket event)."""
+        return self.get_json("/files/list", path=path)["data"]
+
+    def checksum(self, path: str, algorithm: str = "sha256", cancel: threading.Event | None = None) -> str:
+        """
+        Return a server-side checksum. The server answers 202 "hashing" while it
+        hashes a large file in the background, so this polls until the digest is ready.
+        """
+        cancel = cancel or threading.Event()
+        while True:
+            payload = self._load_json("/download/checksum", path=path, algorithm=algorithm)
+            if payload.get("status") != "hashing":
+                break
+            if cancel.wait(CHECKSUM_POLL_INTERVAL):
+                raise TransferCancelledError(f"{path}: cancelled")
+        if payload.get("status") != "success":
+            raise BitFlowError(payload.get("message", "/download/checksum failed"))
+        return payload["checksum"]
+
+    def probe(self, path: str) -> dict:
+        """HEAD a file and return its size and validators."""
+        with self.open("/download/file", method="HEAD", path=path) as resp:
+            return {
+                "size": int(resp.headers["Content-Length"]),
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "ranges": resp.headers.get("Accept-Ranges") == "bytes",
+            }
+
+    def walk(self, path: str):
+        """Yield (logical_path, details) for every file under a logical path, recursively."""
+        listing = self.list_dir(path)
+        if listing["type"] == "file":
+            yield listing["path"], listing["details"]
+            return
+        for child in listing.get("children", []):
+            if child["type"] == "directory":
+                yield from self.walk(child["path"])
+            else:
+                yield child["path"], child["details"]
+
+# ---------------------------
+# Resumable state
+# ---------------------------
+
+def _load_state(state_path: Path) -> dict | None:
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_state(state_path: Path, state: dict):
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+def _file_digest(path: Path, algorithm: str) -> str:
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _plan_segments(size: int, segments: int) -> list:
+    """Split [0, size) into at most `segments` [start, end, done] ranges."""
+    count = max(1, min(segments, -(-size // MIN_SEGMENT_SIZE)))
+    step = -(-size // count)
+    return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+def _same_remote(state: dict, remote: dict, details: dict | None) -> bool:
+    """Check a saved state still describes the remote file (validators, else size + mtime)."""
+    if state.get("size") != remote["size"]:
+        return False
+    if state.get("etag") and remote.get("etag"):
+        return state["etag"] == remote["etag"]
+    if state.get("last_modified") and remote.get("last_modified"):
+        return state["last_modified"] == remote["last_modified"]
+    return bool(details) and state.get("modified") == details.get("modified")
+
+# ---------------------------
+# Downloads
+# ---------------------------
+
+class FileDownload:
+    """
+    One resumable, segmented file download.
+    Data goes to `<dest>.part`; progress goes to `<dest>.bitflow`.
+    """
+
+    def __init__(self, client: BitFlowClient, remote_path: str, dest: Path, segments: int = DEFAULT_SEGMENTS,
+                 retries: int = DEFAULT_RETRIES, verify: str | None = None, details: dict | None = None,
+                 progress_cb=None, cancel: threading.Event | None = None):
+        self.client = client
+        self.remote_path = remote_path
+        self.dest = Path(dest)
+        self.part_path = self.dest.with_name(self.dest.name + PART_SUFFIX)
+        self.state_path = self.dest.with_name(self.dest.name + STATE_SUFFIX)
+        self.segments = segments
+        self.retries = retries
+        self.verify = verify
+        self.details = details
+        self.progress_cb = progress_cb
+        self.cancel = cancel or threading.Event()  # Set to stop every segment between chunks
+        self.state = None
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+
+    def run(self) -> Path:
+        try:
+            self._download()
+        except FileChangedError:
+            # The remote file changed under a resumed download: discard progress and start over once
+            self.state_path.unlink(missing_ok=True)
+            self._download()
+
+        if self.verify:
+            self._verify()
+
+        os.replace(self.part_path, self.dest)
+        self.state_path.unlink(missing_ok=True)
+        return self.dest
+
+    def _download(self):
+        remote = self.client.probe(self.remote_path)
+        self.state = self._prepare(remote)
+
+        pending = [seg for seg in self.state["segments"] if seg[0] + seg[2] <= seg[1]]
+        if not pending:
+            return
+        pool = ThreadPoolExecutor(max_workers=len(pending))
+        try:
+            futures = [pool.submit(self._fetch_segment, seg) for seg in pending]
+            for future in as_completed(futures):
+                future.result()
+        except KeyboardInterrupt:
+            self.cancel.set()
+            raise
+        finally:
+            # On cancel, save what is on disk now instead of waiting for segments in flight
+            cancelled = self.cancel.is_set()
+            pool.shutdown(wait=not cancelled, cancel_futures=cancelled)
+            with self._lock:
+                _save_state(self.state_path, self.state)
+
+    def _prepare(self, remote: dict) -> dict:
+        """Reuse a matching saved state, or start a fresh one."""
+        state = _load_state(self.state_path)
+        if state and self.part_path.exists() and state.get("path") == self.remote_path \
+                and _same_remote(state, remote, self.details):
+            return state
+
+        self.dest.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.part_path, "wb") as f:
+            f.truncate(remote["size"])
+        segments = self.segments if remote["ranges"] else 1
+        state = {
+            "url": self.client.base_url,
+            "path": self.remote_path,
+            "size": remote["size"],
+            "etag": remote.get("etag"),
+            "last_modified": remote.get("last_modified"),
+            "modified": (self.details or {}).get("modified"),
+            "segments": _plan_segments(remote["size"], segments) if remote["size"] else [],
+        }
+        _save_state(self.state_path, state)
+        return state
+
+    def _fetch_segment(self, seg: list):
+        attempt = 0
+        while seg[0] + seg[2] <= seg[1]:
+            try:
+                received = self._fetch_range(seg)
+                if received or seg[0] + seg[2] > seg[1]:
+                    continue
+                # Body ended early without a single byte: treat it like a connection error
+                error = "connection closed before the segment was complete"
+            except (FileChangedError, TransferCancelledError):
+                raise
+            except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+                error = e
+            attempt += 1
+            if attempt > self.retries:
+                raise BitFlowError(f"{self.remote_path}: giving up after {self.retries} retries ({error})")
+            if self.cancel.wait(min(2 ** attempt, 30)):
+                raise TransferCancelledError(f"{self.remote_path}: cancelled")
+
+    def _fetch_range(self, seg: list) -> int:
+        """Fetch the rest of a segment into the part file. Returns the number of bytes received."""
+        start, end, _ = seg
+        received = 0
+        headers = {"Range": f"bytes={start + seg[2]}-{end}"}
+        validator = self.state.get("etag") or self.state.get("last_modified")
+        if validator:
+            headers["If-Range"] = validator
+
+        # Unbuffered, so the progress saved in the state file never runs ahead of the data on disk
+        with self.client.open("/download/file", headers=headers, path=self.remote_path) as resp, \
+                open(self.part_path, "r+b", buffering=0) as f:
+            if resp.status != 206:
+                raise FileChangedError(f"{self.remote_path}: remote file changed")
+            f.seek(start + seg[2])
+            while chunk := resp.read(min(CHUNK_SIZE, end - start - seg[2] + 1)):
+                if self.cancel.is_set():
+                    raise TransferCancelledError(f"{self.remote_path}: cancelled")
+                f.write(chunk)
+                received += len(chunk)
+                with self._lock:
+                    seg[2] += len(chunk)
+                    if self.progress_cb:
+                        self.progress_cb(self.remote_path, len(chunk))
+                    if time.monotonic() - self._last_save >= STATE_SAVE_INTERVAL:
+                        _save_state(self.state_path, self.state)
+                        self._last_save = time.monotonic()
+        return received
+
+    def _verify(self):
+        expected = self.client.checksum(self.remote_path, self.verify, cancel=self.cancel)
+        actual = _file_digest(self.part_path, self.verify)
+        if actual != expected:
+            # Corrupt data can't be resumed; start over next time
+            self.part_path.unlink(missing_ok=True)
+            self.state_path.unlink(missing_ok=True)
+            raise ChecksumMismatchError(f"{self.remote_path}: {self.verify} mismatch ({actual} != {expected})")
+
+def download(client: BitFlowClient, remote_path: str, dest_dir: Path, segments: int = DEFAULT_SEGMENTS,
+             jobs: int = DEFAULT_JOBS, verify: str | None = None, retries: int = DEFAULT_RETRIES,
+             progress_cb=None, done_cb=None, cancel: threading.Event | None = None) -> list:
+    """
+    Download a file or a whole directory tree into `dest_dir`.
+    Directory structure below `remote_path` is recreated locally.
+    Setting `cancel` (or Ctrl-C) stops every transfer between chunks, keeping its progress.
+    Returns a list of (remote_path, local_path or None, error or None).
+    """
+    dest_dir = Path(dest_dir)
+    cancel = cancel or threading.Event()
+    root = client.list_dir(remote_path)
+    # Children come back as normalized logical paths, so strip the server's form of the root, not the argument
+    root_path = root["path"].rstrip("/")
+    base = root_path.rsplit("/", 1)[0] if root["type"] == "file" else root_path
+
+    def task(path, details):
+        local = dest_dir.joinpath(*path[len(base):].lstrip("/").split("/"))
+        FileDownload(client, path, local, segments=segments, retries=retries, verify=verify,
+                     details=details, progress_cb=progress_cb, cancel=cancel).run()
+        return local
+
+    results = []
+    pool = ThreadPoolExecutor(max_workers=jobs)
+    try:
+        futures = {pool.submit(task, path, details): path for path, details in client.walk(remote_path)}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = (path, future.result(), None)
+            except Exception as e:
+                result = (path, None, str(e))
+            results.append(result)
+            if done_cb:
+                done_cb(*result)
+    except KeyboardInterrupt:
+        # Files in flight save their state and stop at their next chunk; queued files never start
+        cancel.set()
+        raise
+    finally:
+        pool.shutdown(wait=not cancel.is_set(), cancel_futures=True)
+    return results
+
+# ---------------------------
+# Delta sync
+# ---------------------------
+# Mirrors backend/utils/sync_utils.py: Adler-32 weak checksums (zlib.adler32)
+# and 16-byte BLAKE2b strong checksums per block.
+
+def choose_block_size(file_size: int) -> int:
+    """Pick a power-of-two block size close to sqrt(file_size), like rsync does."""
+    if file_size <= 0:
+        return MIN_SYNC_BLOCK_SIZE
+    size = 1 << max(0, math.isqrt(file_size) - 1).bit_length()
+    return max(MIN_SYNC_BLOCK_SIZE, min(MAX_SYNC_BLOCK_SIZE, size))
+
+def _strong_checksum(block) -> str:
+    return hashlib.blake2b(block, digest_size=16).hexdigest()
+
+def compute_signatures(path: Path, block_size: int) -> list:
+    """Return [[weak, strong], ...] for every block of a local file."""
+    blocks = []
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            blocks.append([zlib.adler32(block), _strong_checksum(block)])
+    return blocks
+
+def find_blocks(path: Path, blocks: list, block_size: int) -> dict:
+    """
+    Slide a rolling window over a local file and return {block index: local offset}
+    for every remote block whose content already exists locally, at any offset.
+    Past SYNC_MAX_MISS unmatched bytes the window is rolled only through every
+    few blocks, so unrelated data is skipped quickly while still resyncing.
+    """
+    table = {}
+    for index, (weak, strong) in enumerate(blocks):
+        table.setdefault(weak, {}).setdefault(strong, []).append(index)
+
+    found = {}
+    buf = bytearray()
+    base = 0  # File offset of buf[0]
+    pos = 0
+    eof = False
+    weak = None
+    miss_run = 0  # Bytes since the last matched block
+    skipped = 0  # Blocks jumped since the last rolled block
+    with open(path, "rb") as f:
+        while True:
+            while not eof and len(buf) - pos <= block_size:
+                del buf[:pos]
+                base += pos
+                pos = 0
+                chunk = f.read(SYNC_READ_SIZE)
+                if chunk:
+                    buf += chunk
+                else:
+                    eof = True
+
+            n = min(block_size, len(buf) - pos)
+            if n <= 0:
+                break
+            if weak is None or n < block_size:
+                weak = zlib.adler32(buf[pos:pos + n])
+
+            candidates = table.get(weak)
+            indexes = candidates.get(_strong_checksum(buf[pos:pos + n])) if candidates else None
+            if indexes:
+                for index in indexes:
+                    found.setdefault(index, base + pos)
+                pos += n
+                weak = None
+                miss_run = skipped = 0
+                continue
+
+            if n < block_size:
+                break
+            if pos + n >= len(buf):
+                pos += 1
+                weak = None
+                continue
+
+            if miss_run >= SYNC_MAX_MISS and skipped < ROLL_INTERVAL_BLOCKS:
+                # Long unmatched region: only check block-aligned windows
+                pos += n
+                miss_run += n
+                skipped += 1
+                weak = None
+                continue
+
+            a, b = weak & 0xFFFF, weak >> 16
+            rolled_from = pos
+            limit = len(buf) - n
+            if miss_run >= SYNC_MAX_MISS:
+                limit = min(limit, pos + n)
+            while pos < limit:
+                out_byte, in_byte = buf[pos], buf[pos + n]
+                a = (a - out_byte + in_byte) % ADLER_MOD
+                b = (b - n * out_byte + a - 1) % ADLER_MOD
+                pos += 1
+                if ((b << 16) | a) in table:
+                    break
+            weak = (b << 16) | a
+            miss_run += pos - rolled_from
+            skipped = 0
+    return found
+
+def _read_exact(resp, size: int) -> bytes:
+    data = resp.read(size)
+    if len(data) != size:
+        raise BitFlowError("Delta stream ended unexpectedly")
+    return data
+
+class DeltaSync:
+    """
+    Bring a local copy of a remote file up to date, transferring only what changed.
+
+    push: upload the local block signatures; the server streams back copy
+          instructions and the literal bytes that changed.
+    pull: fetch the server's (cached) signatures, find matching blocks locally,
+          and download only the missing ranges with Range requests.
+    Either way the result is verified with SHA-256 before replacing the local file.
+    """
+
+    def __init__(self, client: BitFlowClient, remote_path: str, local_path: Path, mode: str = "push"):
+        self.client = client
+        self.remote_path = remote_path
+        self.local_path = Path(local_path)
+        self.tmp_path = self.local_path.with_name(self.local_path.name + SYNC_SUFFIX)
+        self.mode = mode
+        self.stats = {"mode": mode, "size": 0, "transferred": 0, "reused": 0}
+        self._expected_digest = None
+
+    def run(self) -> dict:
+        if not self.local_path.exists():
+            FileDownload(self.client, self.remote_path, self.local_path, verify="sha256").run()
+            size = self.local_path.stat().st_size
+            self.stats.update({"mode": "download", "size": size, "transferred": size})
+            return self.stats
+
+        try:
+            digest = self._push() if self.mode == "push" else self._pull()
+            if digest != self._expected_digest:
+                raise ChecksumMismatchError(f"{self.remote_path}: sha256 mismatch after delta sync")
+            os.replace(self.tmp_path, self.local_path)
+        finally:
+            self.tmp_path.unlink(missing_ok=True)
+        return self.stats
+
+    def _push(self) -> str:
+        block_size = choose_block_size(self.local_path.stat().st_size)
+        body = json.dumps({"block_size": block_size,
+                           "blocks": compute_signatures(self.local_path, block_size)}).encode()
+        sha256 = hashlib.sha256()
+        headers = {"Content-Type": "application/json"}
+        with self.client.open("/sync/delta", method="POST", headers=headers, data=body, path=self.remote_path) as resp, \
+                open(self.local_path, "rb") as old, open(self.tmp_path, "wb") as out:
+            while True:
+                op = _read_exact(resp, 1)
+                if op == b"C":
+                    start, count = struct.unpack(">QI", _read_exact(resp, 12))
+                    old.seek(start * block_size)
+                    remaining = count * block_size
+                    while remaining > 0 and (chunk := old.read(min(CHUNK_SIZE, remaining))):
+                        out.write(chunk)
+                        sha256.update(chunk)
+                        remaining -= len(chunk)
+                        self.stats["reused"] += len(chunk)
+                elif op == b"L":
+                    length, = struct.unpack(">I", _read_exact(resp, 4))
+                    data = _read_exact(resp, length)
+                    out.write(data)
+                    sha256.update(data)
+                    self.stats["transferred"] += length
+                elif op == b"E":
+                    self.stats["size"], = struct.unpack(">Q", _read_exact(resp, 8))
+                    self._expected_digest = _read_exact(resp, 32).hex()
+                    break
+                else:
+                    raise BitFlowError(f"Unknown delta instruction {op!r}")
+        return sha256.hexdigest()
+
+    def _pull(self) -> str:
+        signature = self.client.get_json("/sync/signature", path=self.remote_path)
+        size, block_size, blocks = signature["size"], signature["block_size"], signature["blocks"]
+        found = find_blocks(self.local_path, blocks, block_size)
+        self.stats["size"] = size
+
+        sha256 = hashlib.sha256()
+        with open(self.local_path, "rb") as old, open(self.tmp_path, "wb") as out:
+            index = 0
+            while index < len(blocks):
+                if index in found:
+                    old.seek(found[index])
+                    data = old.read(min(block_size, size - index * block_size))
+                    out.write(data)
+                    sha256.update(data)
+                    self.stats["reused"] += len(data)
+                    index += 1
+                    continue
+
+                # Coalesce a run of missing blocks into one Range request
+                end = index
+                while end < len(blocks) and end not in found:
+                    end += 1
+                first, last = index * block_size, min(end * block_size, size) - 1
+                headers = {"Range": f"bytes={first}-{last}", "If-Range": signature["etag"]}
+                with self.client.open("/download/file", headers=headers, path=self.remote_path) as resp:
+                    if resp.status != 206:
+                        raise FileChangedError(f"{self.remote_path}: remote file changed during sync")
+                    while chunk := resp.read(CHUNK_SIZE):
+                        out.write(chunk)
+                        sha256.update(chunk)
+                        self.stats["transferred"] += len(chunk)
+                index = end
+
+        self._expected_digest = self.client.checksum(self.remote_path, "sha256")
+        return sha256.hexdigest()
+
+# ---------------------------
+# CLI
+# ---------------------------
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def _non_negative_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, got {value}")
+    return number
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            return f"{size:.1f} {unit}"
+        size /= 1024
+
+def _cmd_download(args) -> int:
+    client = BitFlowClient(args.server, timeout=args.timeout)
+    started = time.monotonic()
+    transferred = [0]
+    lock = threading.Lock()
+
+    def progress_cb(path, nbytes):
+        with lock:
+            transferred[0] += nbytes
+
+    def done_cb(path, local, error):
+        if error:
+            print(f"FAILED {path}: {error}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"done   {path} -> {local}")
+
+    results = download(client, args.path, Path(args.output).expanduser(), segments=args.segments,
+                       jobs=args.jobs, verify=args.verify, retries=args.retries,
+                       progress_cb=progress_cb, done_cb=done_cb)
+
+    elapsed = max(time.monotonic() - started, 1e-6)
+    failed = sum(1 for _, _, error in results if error)
+    if not args.quiet:
+        print(f"{len(results) - failed}/{len(results)} files, {_format_size(transferred[0])} "
+              f"in {elapsed:.1f}s ({_format_size(transferred[0] / elapsed)}/s)")
+    return 1 if failed else 0
+
+def _cmd_sync(args) -> int:
+    client = BitFlowClient(args.server, timeout=args.timeout)
+    started = time.monotonic()
+    stats = DeltaSync(client, args.path, Path(args.local).expanduser(), mode="pull" if args.pull else "push").run()
+    if not args.quiet:
+        print(f"synced {args.path} -> {args.local} ({stats['mode']}): {_format_size(stats['size'])}, "
+              f"{_format_size(stats['transferred'])} transferred, {_format_size(stats['reused'])} reused "
+              f"in {time.monotonic() - started:.1f}s")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bitflow", description="BitFlow command-line client")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Socket timeout in seconds")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    dl = sub.add_parser("download", help="Download a file or directory with parallel, resumable segments")
+    dl.add_argument("server", help="Server base URL, e.g. http://192.168.1.5:8888")
+    dl.add_argument("path", help="Logical path under MEDIA_ROOT")
+    dl.add_argument("-o", "--output", default=".", help="Destination directory (default: current directory)")
+    dl.add_argument("-s", "--segments", type=_positive_int, default=DEFAULT_SEGMENTS, help="Parallel segments per file")
+    dl.add_argument("-j", "--jobs", type=_positive_int, default=DEFAULT_JOBS, help="Files downloaded at once")
+    dl.add_argument("--retries", type=_non_negative_int, default=DEFAULT_RETRIES, help="Retries per segment")
+    dl.add_argument("--verify", nargs="?", const="sha256", default=None,
+                    choices=["md5", "sha1", "sha256", "blake2b"], help="Verify against a server-side checksum")
+    dl.add_argument("-q", "--quiet", action="store_true", help="Only print errors")
+    dl.set_defaults(func=_cmd_download)
+
+    sync = sub.add_parser("sync", help="Update a local copy of a file, transferring only the blocks that changed")
+    sync.add_argument("server", help="Server base URL, e.g. http://192.168.1.5:8888")
+    sync.add_argument("path", help="Logical path under MEDIA_ROOT")
+    sync.add_argument("local", help="Local file to update (downloaded in full if missing)")
+    sync.add_argument("--pull", action="store_true",
+                      help="Match against the server's cached signatures and fetch missing ranges, "
+                           "instead of uploading local signatures")
+    sync.add_argument("-q", "--quiet", action="store_true", help="Only print errors")
+    sync.set_defaults(func=_cmd_sync)
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (BitFlowError, urllib.error.URLError, http.client.HTTPException) as e:
+        print(f"bitflow: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("bitflow: interrupted, run the same command again to resume", file=sys.stderr)
+        return 130
+
+if __name__ == "__main__":
+    sys.exit(main())